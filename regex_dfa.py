@@ -0,0 +1,245 @@
+"""
+Construye, a partir del árbol sintáctico de shunting_yard_regex.py o
+shunting_yard_simp.py, una función de Python que reconoce la expresión:
+
+    árbol → AFN (Thompson) → AFD (subconjuntos) → AFD mínimo (Hopcroft)
+          → código fuente de un `match(s)` con un `if` por estado
+
+El árbol es la tupla (labels, label_id, left, right) de build_syntax_tree();
+los operadores unarios ('*', '+', '?') guardan su operando en left.
+"""
+
+# Operadores del árbol; cualquier otra etiqueta es 'ε' o un literal
+_POSTFIX = frozenset('*+?')
+_BINOPS  = frozenset('.|')
+
+# ——— Paso 1: AFN de Thompson ———
+def thompson(tree):
+    """
+    Devuelve el AFN como (edges, start, accept), donde edges[q] es una lista
+    de transiciones (símbolo, destino) y el símbolo None es una ε-transición.
+    """
+    labels, label_id, left, right = tree
+    edges = []
+
+    def new_state():
+        edges.append([])
+        return len(edges) - 1
+
+    # recorrido iterativo en postorden; los subárboles compartidos (p. ej. el
+    # X de X+ en shunting_yard_simp.py) generan estados nuevos en cada visita
+    frags = []   # pila de fragmentos (inicio, fin)
+    stack = [(len(label_id) - 1, False)]
+    while stack:
+        i, hijos_listos = stack.pop()
+        v = labels[label_id[i]]
+        if not hijos_listos and left[i] >= 0:
+            stack.append((i, True))
+            if right[i] >= 0:
+                stack.append((right[i], False))
+            stack.append((left[i], False))
+            continue
+
+        s, e = new_state(), new_state()
+        if v in _BINOPS:
+            b_s, b_e = frags.pop(); a_s, a_e = frags.pop()
+            if v == '.':
+                edges[s].append((None, a_s)); edges[a_e].append((None, b_s))
+                edges[b_e].append((None, e))
+            else:
+                edges[s] += [(None, a_s), (None, b_s)]
+                edges[a_e].append((None, e)); edges[b_e].append((None, e))
+        elif v in _POSTFIX:
+            a_s, a_e = frags.pop()
+            edges[s].append((None, a_s))
+            edges[a_e].append((None, e))
+            if v != '?':
+                edges[a_e].append((None, a_s))   # repetir
+            if v != '+':
+                edges[s].append((None, e))       # saltar
+        elif v == 'ε':
+            edges[s].append((None, e))
+        else:
+            # literal; "\X" representa al carácter X
+            edges[s].append((v[1] if len(v) == 2 and v[0] == '\\' else v, e))
+        frags.append((s, e))
+
+    start, accept = frags.pop()
+    return edges, start, accept
+
+# ——— Paso 2: construcción de subconjuntos ———
+def _closure(edges, states):
+    stack, seen = list(states), set(states)
+    while stack:
+        q = stack.pop()
+        for sym, t in edges[q]:
+            if sym is None and t not in seen:
+                seen.add(t)
+                stack.append(t)
+    return frozenset(seen)
+
+def subset_construct(nfa):
+    """
+    Devuelve el AFD como (delta, accepting): delta[q] es un dict
+    símbolo → estado y el estado inicial es 0.
+    """
+    edges, start, accept = nfa
+    first = _closure(edges, (start,))
+    ids = {first: 0}
+    pending = [first]
+    delta, accepting = [], set()
+    while pending:
+        S = pending.pop()
+        q = ids[S]
+        while len(delta) <= q:
+            delta.append({})
+        if accept in S:
+            accepting.add(q)
+        moves = {}
+        for p in S:
+            for sym, t in edges[p]:
+                if sym is not None:
+                    moves.setdefault(sym, set()).add(t)
+        for sym, targets in moves.items():
+            T = _closure(edges, targets)
+            if T not in ids:
+                ids[T] = len(ids)
+                pending.append(T)
+            delta[q][sym] = ids[T]
+    return delta, accepting
+
+# ——— Paso 3: minimización de Hopcroft ———
+def hopcroft_minimize(dfa):
+    """Devuelve el AFD mínimo equivalente, con la misma forma que subset_construct()."""
+    delta, accepting = dfa
+    n = len(delta)
+    dead = n   # estado sumidero implícito para completar el AFD
+    alphabet = sorted({sym for row in delta for sym in row})
+
+    # transiciones inversas: inv[sym][t] = estados que van a t con sym
+    inv = {sym: [[] for _ in range(n + 1)] for sym in alphabet}
+    for q in range(n + 1):
+        for sym in alphabet:
+            t = delta[q].get(sym, dead) if q < n else dead
+            inv[sym][t].append(q)
+
+    # partición inicial: aceptación / no aceptación (el sumidero va con las
+    # de no aceptación); block_of[q] es el bloque que contiene a q
+    F = set(accepting)
+    blocks = [blk for blk in (set(F), set(range(n + 1)) - F) if blk]
+    block_of = [0] * (n + 1)
+    for b, blk in enumerate(blocks):
+        for q in blk:
+            block_of[q] = b
+    W = set(range(len(blocks)))   # bloques pendientes como separadores
+    while W:
+        A = list(blocks[W.pop()])   # copia: el bloque puede partirse abajo
+        for sym in alphabet:
+            # solo se revisan los bloques que tocan los predecesores de A
+            touched = {}
+            for t in A:
+                for p in inv[sym][t]:
+                    touched.setdefault(block_of[p], []).append(p)
+            for b, moved in touched.items():
+                Y = blocks[b]
+                if len(moved) == len(Y):
+                    continue
+                Y.difference_update(moved)
+                new = len(blocks)
+                blocks.append(set(moved))
+                for p in moved:
+                    block_of[p] = new
+                if b in W or len(moved) <= len(Y):
+                    W.add(new)
+                else:
+                    W.add(b)
+
+    # renumerar por orden de recorrido desde el inicio, sin el sumidero
+    dead_blk = block_of[dead]
+    if block_of[0] == dead_blk:
+        return [{}], set()
+    ids = {block_of[0]: 0}
+    order = [block_of[0]]
+    new_delta = []
+    for b in order:
+        q = next(iter(blocks[b]))
+        row = {}
+        for sym in alphabet:
+            tb = block_of[delta[q].get(sym, dead) if q < n else dead]
+            if tb == dead_blk:
+                continue
+            if tb not in ids:
+                ids[tb] = len(order)
+                order.append(tb)
+            row[sym] = ids[tb]
+        new_delta.append(row)
+    new_accepting = {ids[b] for b in order if next(iter(blocks[b])) in F}
+    return new_delta, new_accepting
+
+# ——— Paso 4: generación de código ———
+def emit(dfa, name='match'):
+    """Devuelve el código fuente de una función `name(s)` que simula el AFD."""
+    delta, accepting = dfa
+    lines = [f"def {name}(s):", "    state = 0", "    for ch in s:"]
+    for q, row in enumerate(delta):
+        lines.append(f"        {'if' if q == 0 else 'elif'} state == {q}:")
+        if not row:
+            lines.append("            return False")
+            continue
+        for k, (sym, t) in enumerate(sorted(row.items())):
+            lines.append(f"            {'if' if k == 0 else 'elif'} ch == {sym!r}: state = {t}")
+        lines.append("            else: return False")
+    if accepting:
+        estados = ', '.join(map(str, sorted(accepting)))
+        lines.append(f"    return state in {{{estados}}}")
+    else:
+        lines.append("    return False")
+    return "\n".join(lines) + "\n"
+
+def compile_matcher(tree):
+    """
+    Devuelve una función match(s) -> bool para el árbol dado. No guarda
+    nada en caché; shunting_yard.compile_regex_matcher() lo hace por
+    expresión.
+    """
+    source = emit(hopcroft_minimize(subset_construct(thompson(tree))))
+    namespace = {}
+    exec(compile(source, "<regex_dfa>", 'exec'), namespace)
+    return namespace['match']
+
+# ——— Autoprueba: python regex_dfa.py ———
+def _random_regex(rng, depth):
+    """Expresión aleatoria sobre 'abc' que `re` entiende igual que los scripts."""
+    if depth == 0 or rng.random() < 0.3:
+        return rng.choice('abc')
+    kind = rng.randrange(3)
+    a = _random_regex(rng, depth - 1)
+    if kind == 0:
+        return a + _random_regex(rng, depth - 1)
+    if kind == 1:
+        return f"({a}|{_random_regex(rng, depth - 1)})"
+    return f"({a}){rng.choice('*+?')}"
+
+def _autoprueba(n=300, seed=0):
+    """Compara compile_matcher() con re.fullmatch en n expresiones aleatorias."""
+    import itertools
+    import random
+    import re
+    import shunting_yard_regex
+    import shunting_yard_simp
+
+    rng = random.Random(seed)
+    cadenas = [''.join(p) for k in range(6) for p in itertools.product('abc', repeat=k)]
+    for _ in range(n):
+        expr = _random_regex(rng, 4)
+        esperado = re.compile(expr)
+        for mod in (shunting_yard_regex, shunting_yard_simp):
+            postfix, _, _ = mod.regex_to_postfix(expr)
+            match = compile_matcher(mod.build_syntax_tree(postfix))
+            for s in cadenas:
+                if match(s) != bool(esperado.fullmatch(s)):
+                    raise AssertionError(f"{mod.__name__}: {expr!r} con {s!r}")
+    print(f"ok: {n} expresiones")
+
+if __name__ == '__main__':
+    _autoprueba()
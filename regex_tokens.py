@@ -0,0 +1,29 @@
+"""
+Ids de token y tablas de clasificación compartidos por shunting_yard.py,
+sy_cy.pyx y sy_numba.py.
+"""
+
+# Ids de token: literales y escapes primero, luego paréntesis y operadores
+(TOK_LIT, TOK_ESC, TOK_LP, TOK_RP, TOK_STAR, TOK_PLUS, TOK_QMARK,
+ TOK_ALT, TOK_CAT, TOK_OTHER) = range(10)
+
+# Texto de cada token sin payload propio, indexado por id
+SYM = ('', '', '(', ')', '*', '+', '?', '|', '.', '')
+
+# Precedencia indexada por id; cualquier otro token (p. ej. '(') vale 0
+PREC = (0, 0, 0, 0, 3, 3, 3, 1, 2, 0)
+
+# Id de los caracteres especiales; el resto es literal si es alfanumérico
+# (incluida 'ε', que shunting_yard_simp.py usa como cadena vacía)
+CHAR_TOK = {'(': TOK_LP, ')': TOK_RP, '*': TOK_STAR, '+': TOK_PLUS,
+            '?': TOK_QMARK, '|': TOK_ALT, '.': TOK_CAT,
+            '_': TOK_LIT, '[': TOK_LIT, ']': TOK_LIT, '{': TOK_LIT, '}': TOK_LIT}
+
+# Tabla para str.translate: cada carácter ASCII (y los de CHAR_TOK) se
+# reemplaza por un dígito con su id de token
+CLASS = str.maketrans({
+    **{chr(c): str(TOK_LIT if chr(c).isalnum() else TOK_OTHER) for c in range(128)},
+    **{ch: str(tid) for ch, tid in CHAR_TOK.items()},
+    '\\': str(TOK_ESC),
+})
+CLASS_TID = {str(tid): tid for tid in range(10)}
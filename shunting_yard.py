@@ -0,0 +1,254 @@
+"""
+Partes comunes de shunting_yard_regex.py y shunting_yard_simp.py: tokens con
+concatenación explícita, Shunting-Yard, caché por expresión y dibujo con
+Graphviz. Cada script aporta su propio build_syntax_tree().
+"""
+
+import functools
+import io
+import subprocess
+from array import array
+
+from regex_dfa import compile_matcher
+from regex_tokens import (TOK_LIT, TOK_ESC, TOK_LP, TOK_RP, TOK_ALT, TOK_CAT,
+                          TOK_OTHER, SYM, PREC, CLASS, CLASS_TID)
+
+try:
+    import sy_cy   # versión compilada opcional: cythonize -i sy_cy.pyx
+except ImportError:
+    sy_cy = None
+
+# Versión opcional con Numba (requiere numba y numpy); solo se carga con
+# usar_numba(), porque en expresiones cortas es más lenta que la de Python
+sy_numba = None
+
+# Escapes necesarios dentro de una etiqueta DOT entre comillas
+_DOT_ESCAPE = str.maketrans({'"': '\\"', '\\': '\\\\'})
+
+# Bloque final de todo PNG (longitud 0, tipo IEND y su CRC)
+_PNG_END = b'\x00\x00\x00\x00IEND\xaeB`\x82'
+
+
+# ——— Paso 1: tokens con concatenaciones explícitas ———
+def tokenize(expr: str):
+    """
+    Genera los tokens de expr como pares (id, texto), insertando al vuelo la
+    concatenación implícita. El texto es None para paréntesis y operadores.
+    """
+    classes = expr.translate(CLASS)   # clasifica todos los caracteres en C
+    tget = CLASS_TID.get
+    prev = TOK_LP   # el primer token nunca lleva concatenación delante
+    i, n = 0, len(expr)
+    while i < n:
+        tid = tget(classes[i])
+        if tid is None:
+            # carácter no ASCII que no está en la tabla
+            tid = TOK_LIT if expr[i].isalnum() else TOK_OTHER
+        if tid == TOK_ESC:
+            tok = expr[i:i+2]
+            i += len(tok)
+        else:
+            tok = expr[i] if tid == TOK_LIT or tid == TOK_OTHER else None
+            i += 1
+        # si prev no es '|', '(', y tok no es '|', ')' ni operador posfijo, concatenar
+        if prev != TOK_ALT and prev != TOK_LP and not (TOK_RP <= tid <= TOK_ALT):
+            yield TOK_CAT, None
+        yield tid, tok
+        prev = tid
+
+def tokens_to_str(tokens):
+    """Texto de una secuencia de pares (id, texto)."""
+    return ''.join(SYM[tid] if tok is None else tok for tid, tok in tokens)
+
+# ——— Paso 2: Shunting-Yard ———
+def regex_to_postfix(expr: str, trace=False):
+    """
+    Convierte expr a postfix en una sola pasada: los tokens de tokenize()
+    alimentan directamente la salida y la pila de Shunting-Yard. Devuelve
+    ((ids, payload), tokens, pasos): el postfix con la misma forma de tokens
+    que tokenize(), el texto de esos tokens (como tokens_to_str()) y los
+    pasos, que solo se registran si trace es verdadero.
+    """
+    if sy_numba is not None and not trace:
+        postfix, tokens = sy_numba.postfix(tokenize(expr))
+        return postfix, tokens, []
+
+    # salida y pila preasignadas: cada carácter produce a lo sumo un token
+    # más una concatenación, así que 2 * len(expr) siempre alcanza
+    cap = 2 * len(expr)
+    out_ids, out_payload = array('i', [0]) * cap, [None] * cap
+    stack, pasos, texto = [0] * cap, [], []
+    opos = sp = 0
+    for tid, tok in tokenize(expr):
+        texto.append(SYM[tid] if tok is None else tok)
+        # literales y escapes
+        if tid <= TOK_ESC:
+            out_ids[opos] = tid; out_payload[opos] = tok; opos += 1
+            if trace:
+                pasos.append((f"operand {tok}", 'out', tok))
+        elif tid == TOK_LP:
+            stack[sp] = tid; sp += 1
+            if trace:
+                pasos.append(("push (", 'push', '('))
+        elif tid == TOK_RP:
+            while sp and stack[sp-1] != TOK_LP:
+                sp -= 1; op = stack[sp]
+                out_ids[opos] = op; opos += 1
+                if trace:
+                    pasos.append(("pop for )", 'pop', SYM[op]))
+            if sp and stack[sp-1] == TOK_LP:
+                sp -= 1
+                if trace:
+                    pasos.append(("pop (", 'drop', '('))
+            elif trace:
+                pasos.append(("ignore unmatched )", '', ')'))
+        elif tid <= TOK_CAT:
+            prec = PREC[tid]
+            while sp and PREC[stack[sp-1]] >= prec:
+                if stack[sp-1] == TOK_LP:
+                    break
+                sp -= 1; op = stack[sp]
+                out_ids[opos] = op; opos += 1
+                if trace:
+                    pasos.append((f"pop op {SYM[op]}", 'pop', SYM[op]))
+            stack[sp] = tid; sp += 1
+            if trace:
+                pasos.append((f"push op {SYM[tid]}", 'push', SYM[tid]))
+        elif trace:
+            pasos.append((f"ignore {tok}", '', tok))
+
+    while sp:
+        sp -= 1; op = stack[sp]
+        out_ids[opos] = op; opos += 1
+        if trace:
+            pasos.append((f"pop end {SYM[op]}", 'pop', SYM[op]))
+
+    del out_ids[opos:], out_payload[opos:]
+    return (out_ids, out_payload), ''.join(texto), pasos
+
+def replay(pasos):
+    """
+    Reconstruye bajo demanda el estado de salida y pila de cada paso.
+    Cada paso es (acción, efecto, token) con efecto en:
+      'out'  → token va a la salida
+      'push' → token entra a la pila
+      'pop'  → tope de la pila pasa a la salida
+      'drop' → tope de la pila se descarta
+      ''     → sin cambios
+    """
+    output, stack = [], []
+    for accion, efecto, token in pasos:
+        if efecto == 'out':
+            output.append(token)
+        elif efecto == 'push':
+            stack.append(token)
+        elif efecto == 'pop':
+            output.append(stack.pop())
+        elif efecto == 'drop':
+            stack.pop()
+        yield accion, ''.join(output), ''.join(stack)
+
+def usar_numba():
+    """
+    Hace que regex_to_postfix() use sy_numba cuando no se pide trace. Lanza
+    ImportError si numba o numpy no están instalados.
+    """
+    global sy_numba
+    import sy_numba
+
+# Si existe la versión compilada, reemplaza a los pasos 1 y 2
+if sy_cy is not None:
+    regex_to_postfix = sy_cy.regex_to_postfix
+
+# ——— Paso 3: el árbol como objetos (build_syntax_tree() está en cada script) ———
+class RegexNode:
+    # solo para quien prefiera trabajar con objetos; ver tree_to_nodes()
+    __slots__ = ('value', 'left', 'right')
+
+    def __init__(self, value, left=None, right=None):
+        self.value = value
+        self.left  = left
+        self.right = right
+
+def tree_to_nodes(tree):
+    """Convierte el árbol en objetos RegexNode y devuelve la raíz."""
+    labels, label_id, left, right = tree
+    nodes = []
+    for k, l, r in zip(label_id, left, right):
+        nodes.append(RegexNode(labels[k], nodes[l] if l >= 0 else None,
+                                  nodes[r] if r >= 0 else None))
+    return nodes[-1]
+
+# ——— Pasos 1 a 3 con caché ———
+@functools.lru_cache(maxsize=4096)
+def compile_regex(expr: str, build_syntax_tree):
+    """
+    Devuelve (tokens, postfix, tree) para expr, con tokens y postfix ya como
+    texto y el árbol armado por build_syntax_tree (la del script que llama).
+    Las líneas repetidas reutilizan el resultado, así que el árbol no debe
+    modificarse.
+    """
+    postfix, tokens, _ = regex_to_postfix(expr)
+    return tokens, tokens_to_str(zip(*postfix)), build_syntax_tree(postfix)
+
+@functools.lru_cache(maxsize=4096)
+def compile_regex_matcher(expr: str, build_syntax_tree):
+    """Función match(s) para expr, construida sobre el árbol de compile_regex()."""
+    return compile_matcher(compile_regex(expr, build_syntax_tree)[2])
+
+# ——— Paso 4: visualizar con Graphviz ———
+def tree_to_dot(tree, name='G'):
+    """Devuelve el árbol como un grafo DOT llamado `name`."""
+    labels, label_id, left, right = tree
+    escaped = [label.translate(_DOT_ESCAPE) for label in labels]
+    buf = io.StringIO()
+    write = buf.write   # métodos usados en el ciclo, ligados una sola vez
+    write(f"digraph {name} {{\n")
+    write("\trankdir=BT\n")   # raíz arriba, hojas abajo (puedes omitir si es por defecto)
+
+    # recorrido iterativo: cada entrada es (nodo, estado)
+    #   0 → primera visita, 1 → hijo izquierdo listo, 2 → hijo derecho listo
+    stack = [(len(label_id) - 1, 0)]
+    push, pop = stack.append, stack.pop
+    nid = [0] * len(label_id)   # número con el que se dibujó cada nodo
+    count = 0
+    while stack:
+        i, state = pop()
+        if state == 0:
+            nid[i] = count
+            write(f'\tn{count} [label="{escaped[label_id[i]]}"]\n')
+            count += 1
+            # primero procesamos los hijos…
+            push((i, 1))
+            if left[i] >= 0:
+                push((left[i], 0))
+        elif state == 1:
+            # …y dibujamos la flecha desde el hijo hacia este nodo
+            if left[i] >= 0:
+                write(f"\tn{nid[left[i]]} -> n{nid[i]}\n")
+            push((i, 2))
+            if right[i] >= 0:
+                push((right[i], 0))
+        elif right[i] >= 0:
+            write(f"\tn{nid[right[i]]} -> n{nid[i]}\n")
+
+    write("}\n")
+    return buf.getvalue()
+
+def render_dot(trees):
+    """
+    Genera <filename>.png para cada par (filename, tree) de `trees` con un
+    solo proceso `dot`: todos los grafos van por la entrada estándar y las
+    imágenes, que `dot` escribe una tras otra, se separan por su bloque IEND.
+    """
+    if not trees:
+        return
+    source = "".join(tree_to_dot(tree, name=filename) for filename, tree in trees)
+    res = subprocess.run(["dot", "-Tpng"], input=source.encode('utf-8'),
+                         stdout=subprocess.PIPE, check=True)
+    pngs = res.stdout.split(_PNG_END)[:-1]
+    if len(pngs) != len(trees):
+        raise RuntimeError(f"dot generó {len(pngs)} imágenes para {len(trees)} árboles")
+    for (filename, _), png in zip(trees, pngs):
+        with open(filename + ".png", 'wb') as out:
+            out.write(png + _PNG_END)
@@ -4,163 +4,113 @@ Convierte expresiones regulares infijas a postfix, construye un árbol sintácti
 y lo renderiza con Graphviz.
 
 Uso:
-    python shunting_yard_tree.py expresiones.txt
+    python shunting_yard_regex.py expresiones.txt [--trace] [--match CADENA ...] [--numba]
 
 Genera un PNG "tree_<número>.png" por cada línea procesada.
 """
 
-import sys
+import argparse
+from array import array
 
-from graphviz import Digraph
-
-
-# ——— Paso 1: inserción de concatenaciones explícitas ———
-def insert_concatenation(expr: str):
-    tokens = []
-    i = 0
-    while i < len(expr):
-        if expr[i] == '\\' and i+1 < len(expr):
-            tokens.append(expr[i:i+2])
-            i += 2
-        else:
-            tokens.append(expr[i])
-            i += 1
-
-    result = []
-    for j, tok in enumerate(tokens):
-        if j > 0:
-            prev = tokens[j-1]
-            # si prev no es '|', '(', y tok no es operador ni ')', concatenar
-            if prev not in ['|','('] and tok not in ['|',')','*','+','?']:
-                result.append('.')
-        result.append(tok)
-    return result
-
-# ——— Paso 2: Shunting-Yard ———
-def precedence(op: str):
-    if op in ('*','+','?'): return 3
-    if op == '.':        return 2
-    if op == '|':        return 1
-    return 0
-
-def shunting_yard(tokens):
-    output = []
-    stack  = []
-    pasos  = []
-    for token in tokens:
-        # literals y escapes
-        if token.startswith('\\') or (len(token)==1 and (token.isalnum() or token in ['_','[',']','{','}'])):
-            output.append(token)
-            pasos.append((f"operand {token}", output.copy(), stack.copy()))
-        elif token == '(':
-            stack.append(token)
-            pasos.append(("push (", output.copy(), stack.copy()))
-        elif token == ')':
-            while stack and stack[-1] != '(':
-                op = stack.pop()
-                output.append(op)
-                pasos.append(("pop for )", output.copy(), stack.copy()))
-            if stack and stack[-1]=='(':
-                stack.pop()
-                pasos.append(("pop (", output.copy(), stack.copy()))
-            else:
-                pasos.append(("ignore unmatched )", output.copy(), stack.copy()))
-        elif token in ['|','.','*','+','?']:
-            while stack and precedence(stack[-1]) >= precedence(token):
-                if stack[-1] == '(': break
-                op = stack.pop()
-                output.append(op)
-                pasos.append((f"pop op {op}", output.copy(), stack.copy()))
-            stack.append(token)
-            pasos.append((f"push op {token}", output.copy(), stack.copy()))
-        else:
-            pasos.append((f"ignore {token}", output.copy(), stack.copy()))
-
-    while stack:
-        op = stack.pop()
-        output.append(op)
-        pasos.append((f"pop end {op}", output.copy(), stack.copy()))
-
-    return output, pasos
+from regex_tokens import TOK_STAR, TOK_QMARK, TOK_ALT, TOK_CAT, SYM
+import shunting_yard
+from shunting_yard import regex_to_postfix, replay, render_dot, usar_numba
 
 # ——— Paso 3: construir árbol sintáctico ———
-class RegexNode:
-    def __init__(self, value, left=None, right=None):
-        self.value = value
-        self.left  = left
-        self.right = right
-
-def build_syntax_tree(postfix_tokens):
+def build_syntax_tree(postfix):
+    """
+    Construye el árbol como (labels, label_id, left, right): labels es la
+    tupla de etiquetas distintas y los otros tres son arrays paralelos
+    indexados por id de nodo, con -1 donde no hay hijo. Los hijos siempre
+    tienen un id menor que su padre, así que la raíz es el último nodo.
+    """
+    ids, payload = postfix
+    label_of = {}   # etiqueta → id, en orden de aparición
+    label_id, left, right = array('I'), array('i'), array('i')
+    setlabel = label_of.setdefault
     stack = []
-    for tok in postfix_tokens:
-        if tok in ('*','+','?'):
-            child = stack.pop()
-            stack.append(RegexNode(tok, left=child))
-        elif tok in ('.','|'):
-            right = stack.pop()
-            left  = stack.pop()
-            stack.append(RegexNode(tok, left=left, right=right))
+    for tid, tok in zip(ids, payload):
+        if TOK_STAR <= tid <= TOK_QMARK:
+            l, r = stack.pop(), -1
+            label_id.append(setlabel(SYM[tid], len(label_of)))
+        elif tid == TOK_ALT or tid == TOK_CAT:
+            r = stack.pop(); l = stack.pop()
+            label_id.append(setlabel(SYM[tid], len(label_of)))
         else:
-            stack.append(RegexNode(tok))
-    return stack.pop()
-
-# ——— Paso 4: visualizar con Graphviz ———
-def visualize_with_graphviz(root, filename='tree'):
-    dot = Digraph(format='png')
-    dot.attr(rankdir='BT')   # raíz arriba, hojas abajo (puedes omitir si es por defecto)
-    count = 0
-
-    def visit(node):
-        nonlocal count
-        nid = f"n{count}"
-        count += 1
-        dot.node(nid, label=node.value)
-        # primero procesamos recursivamente los hijos…
-        if node.left:
-            lid = visit(node.left)
-            # …y dibujamos la flecha desde el hijo hacia este nodo
-            dot.edge(lid, nid)
-        if node.right:
-            rid = visit(node.right)
-            dot.edge(rid, nid)
-        return nid
-
-    visit(root)
-    dot.render(filename, cleanup=True)
+            # un '(' sin cerrar también llega aquí como hoja
+            l = r = -1
+            label_id.append(setlabel(SYM[tid] if tok is None else tok, len(label_of)))
+        left.append(l); right.append(r)
+        stack.append(len(label_id) - 1)
+    if not stack:
+        raise IndexError("postfix vacío: no hay árbol que construir")
+    return tuple(label_of), label_id, left, right
+
+# ——— Pasos 1 a 3 con caché ———
+def compile_regex(expr: str):
+    """(tokens, postfix, tree) de expr; ver shunting_yard.compile_regex()."""
+    return shunting_yard.compile_regex(expr, build_syntax_tree)
+
+def compile_regex_matcher(expr: str):
+    """Función match(s) para expr; ver shunting_yard.compile_regex_matcher()."""
+    return shunting_yard.compile_regex_matcher(expr, build_syntax_tree)
 
 # ——— Función principal ———
-def procesar_archivo(path):
-    with open(path, encoding='utf-8') as f:
-        idx = 1
-        for linea in f:
-            expr = linea.strip()
-            if not expr or expr.startswith('#'):
-                continue
-
-            print(f"\n=== Línea {idx} ===")
-            print("Infijo:", expr)
-
-            tokens = insert_concatenation(expr)
-            print("Tokens (+ concat):", ''.join(tokens))
-
-            postfix, pasos = shunting_yard(tokens)
-            print("Postfix:", ''.join(postfix))
-
-            # opcional: mostrar pasos
-            for a,o,p in pasos:
-                print(f"  {a:12} | out={''.join(o):15} | stk={''.join(p)}")
-
-            # árbol
-            root = build_syntax_tree(postfix)
-            png_name = f"tree_{idx}"
-            visualize_with_graphviz(root, filename=png_name)
+def procesar_archivo(path, trace=False, cadenas=()):
+    trees = []   # (nombre, árbol); se renderizan todos al final
+    try:
+        with open(path, encoding='utf-8') as f:
+            idx = 1
+            for linea in f:
+                expr = linea.strip()
+                if not expr or expr.startswith('#'):
+                    continue
+
+                print(f"\n=== Línea {idx} ===")
+                print("Infijo:", expr)
+
+                tokens, postfix, tree = compile_regex(expr)
+                print("Tokens (+ concat):", tokens)
+                print("Postfix:", postfix)
+
+                # opcional: mostrar pasos (--trace)
+                if trace:
+                    _, _, pasos = regex_to_postfix(expr, trace=True)
+                    for a,o,p in replay(pasos):
+                        print(f"  {a:12} | out={o:15} | stk={p}")
+
+                # árbol
+                png_name = f"tree_{idx}"
+                trees.append((png_name, tree))
+
+                # cadenas a reconocer con el AFD generado (opcional)
+                if cadenas:
+                    match = compile_regex_matcher(expr)
+                    for cadena in cadenas:
+                        print(f"  ¿{cadena!r} coincide? {'sí' if match(cadena) else 'no'}")
+
+                idx += 1
+    finally:
+        # aunque una línea falle, se dibujan los árboles ya construidos
+        render_dot(trees)
+        for png_name, _ in trees:
             print(f"Árbol sintáctico guardado en: {png_name}.png")
 
-            idx += 1
-
 if __name__ == '__main__':
-    if len(sys.argv) != 2:
-        print("Uso: python shunting_yard_tree.py <archivo_expresiones.txt>")
-        sys.exit(1)
-    procesar_archivo(sys.argv[1])
+    parser = argparse.ArgumentParser(
+        description="Convierte expresiones regulares a postfix y dibuja su árbol sintáctico.")
+    parser.add_argument('archivo', help="archivo con una expresión regular por línea")
+    parser.add_argument('--trace', action='store_true',
+                        help="mostrar los pasos internos de Shunting-Yard")
+    parser.add_argument('--match', metavar='CADENA', action='append', default=[],
+                        help="cadena a reconocer con cada expresión (se puede repetir)")
+    parser.add_argument('--numba', action='store_true',
+                        help="usar Shunting-Yard compilado con Numba (sin --trace)")
+    args = parser.parse_args()
+    if args.numba:
+        try:
+            usar_numba()
+        except ImportError:
+            parser.error("--numba requiere numba y numpy")
+    procesar_archivo(args.archivo, trace=args.trace, cadenas=args.match)
 
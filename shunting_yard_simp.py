@@ -1,229 +1,132 @@
 #!/usr/bin/env python3
 """
 Convierte expresiones regulares infijas a postfix, construye un árbol sintáctico
-y lo renderiza con Graphviz, primero expandiendo '+' y '?' de forma recursiva.
+y lo renderiza con Graphviz, reescribiendo '+' y '?' al construir el árbol:
+  X+ → X.X*
+  X? → X|ε
 
 Uso:
-    python shunting_yard_tree.py expresiones.txt
+    python shunting_yard_simp.py expresiones.txt [--trace] [--match CADENA ...] [--numba]
 
 Genera un PNG "tree_<número>.png" por cada línea procesada.
 """
 
-import sys
+import argparse
+from array import array
 
-from graphviz import Digraph
+from regex_tokens import TOK_STAR, TOK_PLUS, TOK_QMARK, TOK_ALT, TOK_CAT, SYM
+import shunting_yard
+from shunting_yard import regex_to_postfix, replay, render_dot, usar_numba
 
-
-# ——— Paso 0: expandir '+' y '?' recursivamente ———
-def expand_plus_question(expr: str) -> str:
+# ——— Paso 3: construir árbol sintáctico ———
+def build_syntax_tree(postfix):
     """
-    Recorre expr y convierte:
-      X+ → XX*
-      X? → (X|ε)
-    donde X es:
-      1) una secuencia escapada: \X
-      2) un grupo completo: ( ... )
-      3) un literal simple
-    Para los grupos, se llama recursivamente sobre su contenido.
+    Construye el árbol como (labels, label_id, left, right): labels es la
+    tupla de etiquetas distintas y los otros tres son arrays paralelos
+    indexados por id de nodo, con -1 donde no hay hijo. Los hijos siempre
+    tienen un id menor que su padre, así que la raíz es el último nodo.
+
+    '+' y '?' se reescriben aquí mismo; X se comparte, no se copia:
+      X+ → .(X, *(X))
+      X? → |(X, ε)
     """
-    i, n = 0, len(expr)
-    out = ""
-
-    def is_escaped(pos):
-        # True si el char en expr[pos] está precedido por un número impar de '\'
-        cnt = 0
-        k = pos - 1
-        while k >= 0 and expr[k] == '\\':
-            cnt += 1
-            k -= 1
-        return (cnt % 2) == 1
-
-    while i < n:
-        # 1) escape "\X"
-        if expr[i] == '\\' and i+1 < n:
-            token = expr[i:i+2]
-            i += 2
-
-        # 2) grupo "( ... )"
-        elif expr[i] == '(' and not is_escaped(i):
-            start = i
-            depth = 1
-            i += 1
-            while i < n and depth > 0:
-                if expr[i] == '(' and not is_escaped(i):
-                    depth += 1
-                elif expr[i] == ')' and not is_escaped(i):
-                    depth -= 1
-                i += 1
-            # extraemos el contenido interno sin los paréntesis
-            inner = expr[start+1:i-1]
-            # expandimos recursivamente ese interior
-            token = "(" + expand_plus_question(inner) + ")"
-
-        # 3) literal
-        else:
-            token = expr[i]
-            i += 1
-
-        # ¿le sigue un '+' o un '?' (no escapado)?
-        if i < n and not is_escaped(i) and expr[i] in ['+', '?']:
-            op = expr[i]
-            i += 1
-            if op == '+':
-                # X+ → XX*
-                out += token + token + '*'
-            else:  # op == '?'
-                # X? → (X|ε)
-                out += f"({token}|ε)"
-        else:
-            out += token
-
-    return out
-
-# ——— Paso 1: inserción de concatenaciones explícitas ———
-def insert_concatenation(expr: str):
-    tokens = []
-    i = 0
-    while i < len(expr):
-        if expr[i] == '\\' and i+1 < len(expr):
-            tokens.append(expr[i:i+2])
-            i += 2
-        else:
-            tokens.append(expr[i])
-            i += 1
-
-    result = []
-    for j, tok in enumerate(tokens):
-        if j > 0:
-            prev = tokens[j-1]
-            if prev not in ['|','('] and tok not in ['|',')','*','+','?']:
-                result.append('.')
-        result.append(tok)
-    return result
-
-# ——— Paso 2: Shunting-Yard ———
-def precedence(op: str):
-    if op in ('*','+','?'): return 3
-    if op == '.':        return 2
-    if op == '|':        return 1
-    return 0
-
-def shunting_yard(tokens):
-    output, stack, pasos = [], [], []
-    for token in tokens:
-        if token.startswith('\\') or (
-           len(token)==1 and (token.isalnum() or token in ['_','[',']','{','}','ε'])
-        ):
-            output.append(token)
-            pasos.append((f"operand {token}", output.copy(), stack.copy()))
-        elif token == '(':
-            stack.append(token)
-            pasos.append(("push (", output.copy(), stack.copy()))
-        elif token == ')':
-            while stack and stack[-1] != '(':
-                op = stack.pop(); output.append(op)
-                pasos.append(("pop for )", output.copy(), stack.copy()))
-            if stack and stack[-1] == '(':
-                stack.pop()
-                pasos.append(("pop (", output.copy(), stack.copy()))
-            else:
-                pasos.append(("ignore unmatched )", output.copy(), stack.copy()))
-        elif token in ['|','.','*','+','?']:
-            while stack and precedence(stack[-1]) >= precedence(token):
-                if stack[-1] == '(':
-                    break
-                op = stack.pop(); output.append(op)
-                pasos.append((f"pop op {op}", output.copy(), stack.copy()))
-            stack.append(token)
-            pasos.append((f"push op {token}", output.copy(), stack.copy()))
-        else:
-            pasos.append((f"ignore {token}", output.copy(), stack.copy()))
-
-    while stack:
-        op = stack.pop(); output.append(op)
-        pasos.append((f"pop end {op}", output.copy(), stack.copy()))
-
-    return output, pasos
-
-# ——— Paso 3: construir árbol sintáctico ———
-class RegexNode:
-    def __init__(self, value, left=None, right=None):
-        self.value, self.left, self.right = value, left, right
-
-def build_syntax_tree(postfix_tokens):
+    ids, payload = postfix
+    label_of = {}   # etiqueta → id, en orden de aparición
+    label_id, left, right = array('I'), array('i'), array('i')
+    setlabel = label_of.setdefault
     stack = []
-    for tok in postfix_tokens:
-        if tok in ('*','+','?'):
-            child = stack.pop()
-            stack.append(RegexNode(tok, left=child))
-        elif tok in ('.','|'):
-            right = stack.pop(); left = stack.pop()
-            stack.append(RegexNode(tok, left=left, right=right))
+    for tid, tok in zip(ids, payload):
+        if tid == TOK_PLUS or tid == TOK_QMARK:
+            l = stack.pop()
+            if tid == TOK_PLUS:
+                label_id.append(setlabel('*', len(label_of))); left.append(l); right.append(-1)
+            else:
+                label_id.append(setlabel('ε', len(label_of))); left.append(-1); right.append(-1)
+            r = len(label_id) - 1
+            label_id.append(setlabel('.' if tid == TOK_PLUS else '|', len(label_of)))
+        elif tid == TOK_STAR:
+            l, r = stack.pop(), -1
+            label_id.append(setlabel(SYM[tid], len(label_of)))
+        elif tid == TOK_ALT or tid == TOK_CAT:
+            r = stack.pop(); l = stack.pop()
+            label_id.append(setlabel(SYM[tid], len(label_of)))
         else:
-            stack.append(RegexNode(tok))
-    return stack.pop()
-
-# ——— Paso 4: visualizar con Graphviz ———
-def visualize_with_graphviz(root, filename='tree'):
-    dot = Digraph(format='png')
-    dot.attr(rankdir='BT')   # raíz arriba, hojas abajo (puedes omitir si es por defecto)
-    count = 0
-
-    def visit(node):
-        nonlocal count
-        nid = f"n{count}"
-        count += 1
-        dot.node(nid, label=node.value)
-        # primero procesamos recursivamente los hijos…
-        if node.left:
-            lid = visit(node.left)
-            # …y dibujamos la flecha desde el hijo hacia este nodo
-            dot.edge(lid, nid)
-        if node.right:
-            rid = visit(node.right)
-            dot.edge(rid, nid)
-        return nid
-
-    visit(root)
-    dot.render(filename, cleanup=True)
+            # un '(' sin cerrar también llega aquí como hoja
+            l = r = -1
+            label_id.append(setlabel(SYM[tid] if tok is None else tok, len(label_of)))
+        left.append(l); right.append(r)
+        stack.append(len(label_id) - 1)
+    if not stack:
+        raise IndexError("postfix vacío: no hay árbol que construir")
+    return tuple(label_of), label_id, left, right
+
+# ——— Pasos 1 a 3 con caché ———
+def compile_regex(expr: str):
+    """(tokens, postfix, tree) de expr; ver shunting_yard.compile_regex()."""
+    return shunting_yard.compile_regex(expr, build_syntax_tree)
+
+def compile_regex_matcher(expr: str):
+    """Función match(s) para expr; ver shunting_yard.compile_regex_matcher()."""
+    return shunting_yard.compile_regex_matcher(expr, build_syntax_tree)
 
 # ——— Función principal ———
-def procesar_archivo(path):
-    with open(path, encoding='utf-8') as f:
-        idx = 1
-        for linea in f:
-            expr = linea.strip()
-            if not expr or expr.startswith('#'):
-                continue
-
-            # 0) Expandir '+' y '?'
-            expr2 = expand_plus_question(expr)
-            print(f"\n=== Línea {idx} ===")
-            print("Infijo original   :", expr)
-            print("Infijo expandido  :", expr2)
-
-            # 1) Concatenación explícita
-            tokens = insert_concatenation(expr2)
-            print("Tokens (+ concat) :", ''.join(tokens))
-
-            # 2) Postfix
-            postfix, pasos = shunting_yard(tokens)
-            print("Postfix           :", ''.join(postfix))
-
-            # Pasos internos (opcional)
-            for a,o,p in pasos:
-                print(f"  {a:12} | out={''.join(o):15} | stk={''.join(p)}")
-
-            # 3) Árbol
-            root = build_syntax_tree(postfix)
-            png = f"tree_simplified_{idx}"
-            visualize_with_graphviz(root, filename=png)
+def procesar_archivo(path, trace=False, cadenas=()):
+    trees = []   # (nombre, árbol); se renderizan todos al final
+    try:
+        with open(path, encoding='utf-8') as f:
+            idx = 1
+            for linea in f:
+                expr = linea.strip()
+                if not expr or expr.startswith('#'):
+                    continue
+
+                print(f"\n=== Línea {idx} ===")
+                print("Infijo            :", expr)
+
+                # 1) Concatenación explícita
+                tokens, postfix, tree = compile_regex(expr)
+                print("Tokens (+ concat) :", tokens)
+
+                # 2) Postfix
+                print("Postfix           :", postfix)
+
+                # Pasos internos (solo con --trace)
+                if trace:
+                    _, _, pasos = regex_to_postfix(expr, trace=True)
+                    for a,o,p in replay(pasos):
+                        print(f"  {a:12} | out={o:15} | stk={p}")
+
+                # 3) Árbol
+                png = f"tree_simplified_{idx}"
+                trees.append((png, tree))
+
+                # cadenas a reconocer con el AFD generado (opcional)
+                if cadenas:
+                    match = compile_regex_matcher(expr)
+                    for cadena in cadenas:
+                        print(f"  ¿{cadena!r} coincide? {'sí' if match(cadena) else 'no'}")
+
+                idx += 1
+    finally:
+        # aunque una línea falle, se dibujan los árboles ya construidos
+        render_dot(trees)
+        for png, _ in trees:
             print(f"Árbol guardado en : {png}.png")
 
-            idx += 1
-
 if __name__ == '__main__':
-    if len(sys.argv) != 2:
-        print("Uso: python shunting_yard_tree.py <archivo_expresiones.txt>")
-        sys.exit(1)
-    procesar_archivo(sys.argv[1])
+    parser = argparse.ArgumentParser(
+        description="Convierte expresiones regulares a postfix y dibuja su árbol sintáctico.")
+    parser.add_argument('archivo', help="archivo con una expresión regular por línea")
+    parser.add_argument('--trace', action='store_true',
+                        help="mostrar los pasos internos de Shunting-Yard")
+    parser.add_argument('--match', metavar='CADENA', action='append', default=[],
+                        help="cadena a reconocer con cada expresión (se puede repetir)")
+    parser.add_argument('--numba', action='store_true',
+                        help="usar Shunting-Yard compilado con Numba (sin --trace)")
+    args = parser.parse_args()
+    if args.numba:
+        try:
+            usar_numba()
+        except ImportError:
+            parser.error("--numba requiere numba y numpy")
+    procesar_archivo(args.archivo, trace=args.trace, cadenas=args.match)
@@ -0,0 +1,139 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Versión compilada de regex_to_postfix(): tokens con concatenación explícita
+y Shunting-Yard en una sola pasada.
+
+Compilar con:
+    cythonize -i sy_cy.pyx
+
+Si el módulo compilado está disponible, shunting_yard.py lo usa en lugar
+de su versión en Python puro. Devuelve lo mismo: ((ids, payload), tokens,
+pasos).
+"""
+
+from cpython cimport array
+from cpython.unicode cimport PyUnicode_READ_CHAR
+
+import array
+
+import regex_tokens
+from regex_tokens import SYM as _SYM
+
+
+# ——— Ids de token y tablas, copiados de regex_tokens a variables de C ———
+cdef int TOK_LIT = regex_tokens.TOK_LIT
+cdef int TOK_ESC = regex_tokens.TOK_ESC
+cdef int TOK_LP = regex_tokens.TOK_LP
+cdef int TOK_RP = regex_tokens.TOK_RP
+cdef int TOK_ALT = regex_tokens.TOK_ALT
+cdef int TOK_CAT = regex_tokens.TOK_CAT
+cdef int TOK_OTHER = regex_tokens.TOK_OTHER
+
+cdef int PREC[10]
+cdef unsigned char CHAR_TOK[128]
+cdef array.array _INT = array.array('i')
+
+cdef void _init_tablas():
+    cdef int c
+    for c in range(128):
+        CHAR_TOK[c] = int(chr(c).translate(regex_tokens.CLASS))
+    for c in range(10):
+        PREC[c] = regex_tokens.PREC[c]
+
+_init_tablas()
+
+
+# ——— Pasos 1 y 2: tokens con concatenación explícita + Shunting-Yard ———
+cpdef tuple regex_to_postfix(unicode expr, bint trace=False):
+    cdef Py_ssize_t i = 0, n = len(expr), k = 0, sp = 0
+    cdef Py_UCS4 c
+    cdef int tid, cur, op, prec, prev = TOK_LP   # el primer token nunca concatena
+    cdef bint cat
+    cdef array.array out_ids = array.clone(_INT, 2 * n, False)
+    cdef array.array stk = array.clone(_INT, 2 * n, False)
+    cdef int *out = out_ids.data.as_ints
+    cdef int *stack = stk.data.as_ints
+    cdef list out_payload = [None] * (2 * n), pasos = [], texto = []
+    cdef object tok, cur_tok
+
+    while i < n:
+        c = PyUnicode_READ_CHAR(expr, i)
+        if c < 128:
+            tid = CHAR_TOK[c]
+        else:
+            tid = TOK_LIT if c.isalnum() else TOK_OTHER
+        if tid == TOK_ESC:
+            tok = expr[i:i+2]
+            i += len(tok)
+        else:
+            tok = expr[i:i+1] if tid == TOK_LIT or tid == TOK_OTHER else None
+            i += 1
+        # si prev no es '|', '(', y tok no es '|', ')' ni operador posfijo,
+        # la concatenación entra a Shunting-Yard antes que el token
+        cat = prev != TOK_ALT and prev != TOK_LP and not (TOK_RP <= tid <= TOK_ALT)
+        prev = tid
+
+        while True:
+            if cat:
+                cur, cur_tok = TOK_CAT, None
+            else:
+                cur, cur_tok = tid, tok
+            texto.append(_SYM[cur] if cur_tok is None else cur_tok)
+            # literales y escapes
+            if cur <= TOK_ESC:
+                out[k] = cur
+                out_payload[k] = cur_tok
+                k += 1
+                if trace:
+                    pasos.append((f"operand {cur_tok}", 'out', cur_tok))
+            elif cur == TOK_LP:
+                stack[sp] = cur
+                sp += 1
+                if trace:
+                    pasos.append(("push (", 'push', '('))
+            elif cur == TOK_RP:
+                while sp and stack[sp-1] != TOK_LP:
+                    sp -= 1
+                    op = stack[sp]
+                    out[k] = op
+                    k += 1
+                    if trace:
+                        pasos.append(("pop for )", 'pop', _SYM[op]))
+                if sp and stack[sp-1] == TOK_LP:
+                    sp -= 1
+                    if trace:
+                        pasos.append(("pop (", 'drop', '('))
+                else:
+                    if trace:
+                        pasos.append(("ignore unmatched )", '', ')'))
+            elif cur <= TOK_CAT:
+                prec = PREC[cur]
+                while sp and PREC[stack[sp-1]] >= prec:
+                    sp -= 1
+                    op = stack[sp]
+                    out[k] = op
+                    k += 1
+                    if trace:
+                        pasos.append((f"pop op {_SYM[op]}", 'pop', _SYM[op]))
+                stack[sp] = cur
+                sp += 1
+                if trace:
+                    pasos.append((f"push op {_SYM[cur]}", 'push', _SYM[cur]))
+            else:
+                if trace:
+                    pasos.append((f"ignore {cur_tok}", '', cur_tok))
+            if not cat:
+                break
+            cat = False
+
+    while sp:
+        sp -= 1
+        op = stack[sp]
+        out[k] = op
+        k += 1
+        if trace:
+            pasos.append((f"pop end {_SYM[op]}", 'pop', _SYM[op]))
+
+    array.resize(out_ids, k)
+    del out_payload[k:]
+    return (out_ids, out_payload), ''.join(texto), pasos
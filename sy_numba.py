@@ -0,0 +1,81 @@
+"""
+Shunting-Yard compilado con Numba sobre el flujo de ids de token.
+
+Con --numba (ver usar_numba() en shunting_yard.py), regex_to_postfix() lo
+usa cuando no se pide --trace (esta versión no registra los pasos). Solo
+conviene con expresiones largas: en las cortas pesa más la conversión de
+los tokens a un arreglo de numpy. La primera llamada compila la función;
+con cache=True el resultado se guarda en __pycache__.
+"""
+
+from array import array
+
+import numpy as np
+from numba import njit
+
+from regex_tokens import TOK_ESC, TOK_LP, TOK_RP, TOK_CAT, PREC, SYM
+
+PREC_ARR = np.array(PREC, dtype=np.int32)
+
+
+@njit(cache=True)
+def shunting_yard_nb(tok_ids, out, stk):
+    """
+    Recorre tok_ids y escribe en out las posiciones (índices en tok_ids) de
+    los tokens en orden postfix; stk es espacio para la pila. out y stk
+    deben tener al menos len(tok_ids) elementos. Devuelve cuántos se
+    escribieron en out.
+    """
+    k = 0
+    sp = 0
+    for j in range(tok_ids.shape[0]):
+        tid = tok_ids[j]
+        if tid <= TOK_ESC:
+            out[k] = j
+            k += 1
+        elif tid == TOK_LP:
+            stk[sp] = j
+            sp += 1
+        elif tid == TOK_RP:
+            while sp > 0 and tok_ids[stk[sp-1]] != TOK_LP:
+                sp -= 1
+                out[k] = stk[sp]
+                k += 1
+            if sp > 0:
+                sp -= 1   # descartar '('
+        elif tid <= TOK_CAT:
+            prec = PREC_ARR[tid]
+            while sp > 0 and PREC_ARR[tok_ids[stk[sp-1]]] >= prec:
+                sp -= 1
+                out[k] = stk[sp]
+                k += 1
+            stk[sp] = j
+            sp += 1
+        # TOK_OTHER se ignora
+
+    while sp > 0:
+        sp -= 1
+        out[k] = stk[sp]
+        k += 1
+    return k
+
+
+def postfix(tokens):
+    """
+    Convierte los pares (id, texto) de tokenize() a postfix y devuelve
+    ((ids, payload), texto), las dos primeras partes de regex_to_postfix()
+    en shunting_yard.py.
+    """
+    ids, payload, texto = array('i'), [], []
+    for tid, tok in tokens:
+        ids.append(tid); payload.append(tok)
+        texto.append(SYM[tid] if tok is None else tok)
+    n = len(ids)
+    tok_ids = np.frombuffer(ids, dtype=np.int32) if n else np.empty(0, dtype=np.int32)
+    out = np.empty(n, dtype=np.int32)
+    stk = np.empty(n, dtype=np.int32)
+    k = shunting_yard_nb(tok_ids, out, stk)
+    pos = out[:k]
+    out_ids = array('i')
+    out_ids.frombytes(tok_ids[pos].tobytes())
+    return (out_ids, [payload[j] for j in pos.tolist()]), ''.join(texto)